@@ -4,9 +4,6 @@ from collections.abc import Sequence
 from typing import Optional
 
 from packing_packages import __version__
-from packing_packages.install.__main__ import add_arguments_install
-from packing_packages.pack.__main__ import add_arguments_pack
-from packing_packages.pack.yaml.__main__ import add_arguments_pack_from_yaml
 
 __all__ = ("main",)
 
@@ -25,18 +22,30 @@ def main(cli_args: Sequence[str], prog: Optional[str] = None) -> None:
         "pack",
         help="pack conda environment",
     )
-    add_arguments_pack(parser_pack)
-    subparsers_pack = parser_pack.add_subparsers()
-    parser_pack_yaml = subparsers_pack.add_parser(
-        "yaml", help="pack conda environment from yaml"
-    )
-    add_arguments_pack_from_yaml(parser_pack_yaml)
-
     parser_install = subparsers.add_parser(
         "install",
         help="install packages in the conda environment",
     )
-    add_arguments_install(parser_install)
+
+    # Only the arguments of the given subcommand are needed, so the other
+    # subcommands (and their dependencies) are not imported.
+    command = next((arg for arg in cli_args if not arg.startswith("-")), None)
+    if command == "pack":
+        from packing_packages.pack.__main__ import add_arguments_pack
+        from packing_packages.pack.yaml.__main__ import (
+            add_arguments_pack_from_yaml,
+        )
+
+        add_arguments_pack(parser_pack)
+        subparsers_pack = parser_pack.add_subparsers()
+        parser_pack_yaml = subparsers_pack.add_parser(
+            "yaml", help="pack conda environment from yaml"
+        )
+        add_arguments_pack_from_yaml(parser_pack_yaml)
+    elif command == "install":
+        from packing_packages.install.__main__ import add_arguments_install
+
+        add_arguments_install(parser_install)
 
     args = parser.parse_args(cli_args)
     args.func(args)
@@ -12,6 +12,7 @@ from ._helpers import (
     get_env_list,
     is_argument,
     is_installed,
+    run_streaming,
 )
 
 # ドキュメント化したい場合は、モジュールメソッドとして登録するため、__all__に入れる。
@@ -22,4 +23,5 @@ __all__ = (
     "get_env_list",
     "is_argument",
     "is_installed",
+    "run_streaming",
 )
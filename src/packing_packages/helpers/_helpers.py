@@ -1,9 +1,12 @@
+import functools
 import importlib.util
 import inspect
+import logging
 import os
 import subprocess
 import sys
-from collections.abc import Callable, Iterable, Iterator
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, TypeVar
 
 from packing_packages.logging import get_child_logger
@@ -13,9 +16,13 @@ _logger = get_child_logger(__name__)
 T = TypeVar("T")
 
 
+@functools.lru_cache(maxsize=None)
 def is_installed(package_name: str) -> bool:
     """Check if the package is installed.
 
+    The result is cached because it is checked for optional dependencies
+    at import time of many modules.
+
     Parameters
     ----------
     package_name : str
@@ -94,34 +101,97 @@ def check_encoding(encoding: Optional[str]) -> str:
         raise ValueError(f"Invalid encoding: {encoding}") from e
 
 
-def get_env_list(encoding: Optional[str] = None) -> set[str]:
-    """Get list of conda environments.
+def run_streaming(
+    cmd: Sequence[str],
+    encoding: str,
+    logger: Optional[logging.Logger] = None,
+) -> "subprocess.CompletedProcess[str]":
+    """Run a command and log its stdout line by line.
+
+    Unlike ``subprocess.run`` with ``stdout=subprocess.PIPE``, stdout is not
+    buffered as a whole, so the output is logged while the command runs.
+    stderr is read in another thread to avoid a pipe deadlock.
 
     Parameters
     ----------
-    encoding : str, optional
-        Encoding for subprocess output. If None, uses system default encoding, by default None
+    cmd : Sequence[str]
+        Command to run.
+    encoding : str
+        Encoding for subprocess output.
+    logger : logging.Logger, optional
+        Logger for stdout. If None, uses the logger of this module, by default None
 
     Returns
     -------
-    set[str]
-        List of conda environments
+    subprocess.CompletedProcess[str]
+        Result of the command. ``stdout`` is None because it is already logged.
     """
-    encoding = check_encoding(encoding)
+    if logger is None:
+        logger = _logger
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    ) as proc:
+        assert proc.stdout is not None and proc.stderr is not None
+        # do not decode the output that is not logged anyway
+        log_stdout = logger.isEnabledFor(logging.INFO)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future_stderr = executor.submit(proc.stderr.read)
+            for line in proc.stdout:
+                if log_stdout:
+                    logger.info(
+                        line.decode(encoding, errors="replace").rstrip()
+                    )
+            stderr = future_stderr.result()
+        returncode = proc.wait()
+    return subprocess.CompletedProcess(
+        cmd, returncode, None, stderr.decode(encoding, errors="replace")
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_env_list(conda_exe: str, encoding: str) -> frozenset[str]:
     result_conda_env_list = subprocess.run(
         [
-            os.environ["CONDA_EXE"],
+            conda_exe,
             "info",
             "-e",
         ],
         stdout=subprocess.PIPE,
         check=True,
     )
-    return {
+    return frozenset(
         line.split()[0]
-        for line in result_conda_env_list.stdout.decode(encoding).splitlines()
+        for line in result_conda_env_list.stdout.decode(
+            encoding, errors="replace"
+        ).splitlines()
         if line and not line.startswith("#")
-    }
+    )
+
+
+def get_env_list(
+    encoding: Optional[str] = None, refresh: bool = False
+) -> set[str]:
+    """Get list of conda environments.
+
+    The result of ``conda info -e`` is cached in the process.
+
+    Parameters
+    ----------
+    encoding : str, optional
+        Encoding for subprocess output. If None, uses system default encoding, by default None
+    refresh : bool, optional
+        If True, run ``conda info -e`` again instead of using the cache
+        (e.g. after an environment was created), by default False
+
+    Returns
+    -------
+    set[str]
+        List of conda environments
+    """
+    encoding = check_encoding(encoding)
+    if refresh:
+        _get_env_list.cache_clear()
+    return set(_get_env_list(os.environ["CONDA_EXE"], encoding))
 
 
 def check_env_name(
@@ -148,6 +218,9 @@ def check_env_name(
     else:
         # check environment name
         env_name_list = get_env_list(encoding)
+        if env_name not in env_name_list:
+            # the environment may have been created after caching
+            env_name_list = get_env_list(encoding, refresh=True)
         if env_name not in env_name_list:
             raise ValueError(
                 f"Environment '{env_name}' not found. "
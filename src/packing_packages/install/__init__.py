@@ -13,6 +13,20 @@ directory into a conda environment.
 
 """
 
-from ._core import generate_install_scripts, install_packages
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._core import generate_install_scripts, install_packages
 
 __all__ = ("install_packages", "generate_install_scripts")
+
+
+def __getattr__(name: str) -> Any:
+    # lazy import (PEP 562) to keep the CLI startup light
+    if name in __all__:
+        from . import _core
+
+        value = getattr(_core, name)
+        globals()[name] = value  # later accesses skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,25 @@
 import argparse
+import functools
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Optional
 
-from packing_packages.install._core import (
-    generate_install_scripts,
-    install_packages,
-)
+
+def _resolve_path(path: str) -> Path:
+    """Convert a command line argument to an absolute path."""
+    return Path(path).resolve()
 
 
 def install(args: argparse.Namespace) -> None:
     """Install packages in the conda environment."""
-    dirpath_packages = Path(args.dirpath_packages).resolve()
+    from packing_packages.install._core import (
+        generate_install_scripts,
+        install_packages,
+    )
+
+    # usually already resolved by argparse (see `_resolve_path`), but the
+    # Namespace may also be built by hand with a str
+    dirpath_packages = Path(args.dirpath_packages)
     if not dirpath_packages.is_dir():
         raise FileNotFoundError(dirpath_packages)
 
@@ -32,7 +40,7 @@ def install(args: argparse.Namespace) -> None:
 
 def add_arguments_install(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
-        type=Path,
+        type=_resolve_path,
         default=".",
         help=(
             "Path to the directory containing packages to install (e.g., *.tar.bz2, *.conda). "
@@ -84,11 +92,17 @@ def add_arguments_install(parser: argparse.ArgumentParser) -> None:
     parser.set_defaults(func=install)
 
 
-def main(cli_args: Sequence[str], prog: Optional[str] = None) -> None:
-    """Main function to parse arguments and call the install function."""
+@functools.lru_cache(maxsize=8)
+def _get_parser(prog: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the argument parser once for each ``prog``."""
     parser = argparse.ArgumentParser(
         prog=prog, description="Install packages in the conda environment"
     )
     add_arguments_install(parser)
-    args = parser.parse_args(cli_args)
+    return parser
+
+
+def main(cli_args: Sequence[str], prog: Optional[str] = None) -> None:
+    """Main function to parse arguments and call the install function."""
+    args = _get_parser(prog).parse_args(cli_args)
     args.func(args)
@@ -1,5 +1,6 @@
 import os
-import subprocess
+import sys
+from collections.abc import Iterator, Sequence
 from pathlib import Path, PureWindowsPath
 from typing import Optional, Union
 
@@ -12,6 +13,7 @@ from packing_packages.helpers import (
     check_env_name,
     get_env_list,
     is_installed,
+    run_streaming,
 )
 from packing_packages.logging import get_child_logger
 
@@ -32,68 +34,74 @@ MAX_LETTER_LENGTH_BAT = 7000
 But it is recommended to leave some margin for safety.
 """
 
+MAX_LETTER_LENGTH_COMMAND = 30000
+"""Maximum number of letters of one install command line.
 
-def _get_conda_packages_path(
-    dirpath_packages: Union[os.PathLike, str] = ".",
-) -> tuple[Path, ...]:
-    """Get paths of conda package files.
+'32767' is the maximum length of a command line on Windows.
+But it is recommended to leave some margin for safety.
+On Windows, ``conda run`` writes the command into a batch file, so
+`MAX_LETTER_LENGTH_BAT` applies to it instead.
+"""
 
-    Parameters
-    ----------
-    dirpath_packages : Union[os.PathLike, str], optional
-        Directory path to search for conda packages, by default "."
 
-    Returns
-    -------
-    tuple[Path, ...]
-        Tuple of paths to conda package files
-    """
-    dirpath_packages = Path(dirpath_packages)
+_SUFFIXES_CONDA = tuple(f".{ext}" for ext in EXTENSIONS_CONDA)
+_SUFFIXES_PYPI = tuple(f".{ext}" for ext in EXTENSIONS_PYPI)
 
-    return tuple(
-        sum(
-            [
-                [
-                    filepath
-                    for filepath in dirpath_packages.glob(f"**/*{ext}")
-                    if filepath.is_file()
-                ]
-                for ext in EXTENSIONS_CONDA
-            ],
-            start=[],
-        )
+
+def _suffix_index(filename: str, suffixes: tuple[str, ...]) -> int:
+    """Get the index of the first suffix in `suffixes` that `filename` has."""
+    return next(
+        i for i, suffix in enumerate(suffixes) if filename.endswith(suffix)
     )
 
 
-def _get_pypi_packages_path(
+def _get_packages_path(
     dirpath_packages: Union[os.PathLike, str] = ".",
-) -> tuple[Path, ...]:
-    """Get paths of PyPI package files.
+) -> tuple[tuple[Path, ...], tuple[Path, ...]]:
+    """Get paths of conda and PyPI package files.
+
+    The directory tree is walked only once with ``os.scandir``. The paths
+    are grouped by extension in the order of ``EXTENSIONS_CONDA`` and
+    ``EXTENSIONS_PYPI`` (e.g. wheels before sdists), then sorted by file
+    name, so that the result does not depend on the file system.
 
     Parameters
     ----------
     dirpath_packages : Union[os.PathLike, str], optional
-        Directory path to search for PyPI packages, by default "."
+        Directory path to search for packages, by default "."
 
     Returns
     -------
-    tuple[Path, ...]
-        Tuple of paths to PyPI package files
+    tuple[tuple[Path, ...], tuple[Path, ...]]
+        Tuple of (paths to conda package files, paths to PyPI package files)
     """
-    dirpath_packages = Path(dirpath_packages)
-
-    return tuple(
-        sum(
-            [
-                [
-                    filepath
-                    for filepath in dirpath_packages.glob(f"**/*{ext}")
-                    if filepath.is_file()
-                ]
-                for ext in EXTENSIONS_PYPI
-            ],
-            start=[],
-        )
+    list_filepaths_conda: list[Path] = []
+    list_filepaths_pypi: list[Path] = []
+    stack = [os.fspath(dirpath_packages)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif not entry.is_file():
+                    continue
+                elif entry.name.endswith(_SUFFIXES_CONDA):
+                    list_filepaths_conda.append(Path(entry.path))
+                elif entry.name.endswith(_SUFFIXES_PYPI):
+                    list_filepaths_pypi.append(Path(entry.path))
+    return (
+        tuple(
+            sorted(
+                list_filepaths_conda,
+                key=lambda p: (_suffix_index(p.name, _SUFFIXES_CONDA), p.name),
+            )
+        ),
+        tuple(
+            sorted(
+                list_filepaths_pypi,
+                key=lambda p: (_suffix_index(p.name, _SUFFIXES_PYPI), p.name),
+            )
+        ),
     )
 
 
@@ -114,6 +122,108 @@ def _is_python_package(filepath: Path) -> bool:
     return name_lower.startswith("python-") or name_lower.startswith("python_")
 
 
+def _split_by_length(
+    filepaths: Sequence[Path], max_length: int = MAX_LETTER_LENGTH_COMMAND
+) -> Iterator[list[Path]]:
+    """Split package paths so that each command line does not get too long.
+
+    Parameters
+    ----------
+    filepaths : Sequence[Path]
+        Paths to package files
+    max_length : int, optional
+        Maximum number of letters of paths in each chunk, by default MAX_LETTER_LENGTH_COMMAND
+
+    Yields
+    ------
+    list[Path]
+        Chunk of paths, in the same order as ``filepaths``
+    """
+    chunk: list[Path] = []
+    n_str = 0
+    for filepath in filepaths:
+        # +1 for the separator
+        n_str_filepath = len(str(filepath)) + 1
+        if chunk and n_str + n_str_filepath > max_length:
+            yield chunk
+            chunk = []
+            n_str = 0
+        chunk.append(filepath)
+        n_str += n_str_filepath
+    if chunk:
+        yield chunk
+
+
+def _install_package_files(
+    cmd: Sequence[str],
+    filepaths: Sequence[Path],
+    encoding: str,
+    package_type: str,
+    max_length: int = MAX_LETTER_LENGTH_COMMAND,
+) -> list[Path]:
+    """Install package files with as few commands as possible.
+
+    Package files are passed to one command (split only if the command line
+    gets too long). If a command fails, its files are installed one by one
+    to find out which of them failed.
+
+    Parameters
+    ----------
+    cmd : Sequence[str]
+        Install command without package files
+    filepaths : Sequence[Path]
+        Paths to package files, in install order
+    encoding : str
+        Encoding for subprocess output
+    package_type : str
+        Package type for logging, like "conda" or "PyPI"
+    max_length : int, optional
+        Maximum number of letters of each command line including ``cmd``,
+        by default MAX_LETTER_LENGTH_COMMAND
+
+    Returns
+    -------
+    list[Path]
+        Paths to package files that failed to install
+    """
+
+    def _install(filepaths_install: Sequence[Path]) -> bool:
+        result_install = run_streaming(
+            [*cmd, *map(str, filepaths_install)], encoding, _logger
+        )
+        if result_install.returncode != 0:
+            if len(filepaths_install) == 1:
+                _logger.warning(
+                    f"Failed to install {package_type} package: {filepaths_install[0]}"
+                )
+                _logger.error(result_install.stderr)
+            else:
+                _logger.debug(result_install.stderr)
+            return False
+        return True
+
+    list_filepaths_failed: list[Path] = []
+    for chunk in tqdm(
+        list(_split_by_length(filepaths, max_length - len(" ".join(cmd)) - 1)),
+        desc=f"Installing {package_type} packages",
+        unit="batch",
+    ):
+        if _install(chunk):
+            continue
+        if len(chunk) == 1:
+            list_filepaths_failed.extend(chunk)
+            continue
+
+        _logger.info(
+            f"Some {package_type} packages could not be installed. "
+            "Retrying them one by one..."
+        )
+        list_filepaths_failed.extend(
+            filepath for filepath in chunk if not _install([filepath])
+        )
+    return list_filepaths_failed
+
+
 def install_packages(
     env_name: Optional[str] = None,
     dirpath_packages: Union[str, os.PathLike] = ".",
@@ -123,7 +233,9 @@ def install_packages(
 
     This function installs conda packages and PyPI packages from the specified
     directory into the specified conda environment. Conda packages are installed
-    first, with Python packages prioritized. Failed installations are logged.
+    first, with Python packages prioritized. Packages of each type are installed
+    with a single command like the generated install scripts, and retried one by
+    one only if it fails. Failed installations are logged.
 
     Parameters
     ----------
@@ -148,8 +260,9 @@ def install_packages(
 
     dirpath_packages = Path(dirpath_packages).resolve()
 
-    tup_filepaths_conda = _get_conda_packages_path(dirpath_packages)
-    tup_filepaths_pypi = _get_pypi_packages_path(dirpath_packages)
+    tup_filepaths_conda, tup_filepaths_pypi = _get_packages_path(
+        dirpath_packages
+    )
 
     # Sort conda packages: python packages first
     tup_filepaths_conda = tuple(
@@ -159,62 +272,44 @@ def install_packages(
         )
     )
 
-    list_filepaths_conda_failed: list[Path] = []
     # install conda packages
-    for filepath_conda in tqdm(
+    list_filepaths_conda_failed = _install_package_files(
+        [
+            os.environ["CONDA_EXE"],
+            "install",
+            "-y",
+            "-n",
+            env_name,
+            "--offline",
+            "--use-local",
+        ],
         tup_filepaths_conda,
-        desc="Installing conda packages",
-        unit="package",
-    ):
-        result_conda_install = subprocess.run(
-            [
-                os.environ["CONDA_EXE"],
-                "install",
-                "-y",
-                "-n",
-                env_name,
-                "--offline",
-                "--use-local",
-                str(filepath_conda),
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        _logger.info(result_conda_install.stdout.decode(encoding))
-        if result_conda_install.returncode != 0:
-            _logger.warning(
-                f"Failed to install conda package: {filepath_conda}"
-            )
-            _logger.error(result_conda_install.stderr.decode(encoding))
-            list_filepaths_conda_failed.append(filepath_conda)
+        encoding,
+        "conda",
+    )
 
     # install pypi packages
-    list_filepaths_pypi_failed: list[Path] = []
-    for filepath_pypi in tqdm(
+    list_filepaths_pypi_failed = _install_package_files(
+        [
+            os.environ["CONDA_EXE"],
+            "run",
+            "-n",
+            env_name,
+            "pip",
+            "install",
+            "--no-deps",
+            "--no-build-isolation",
+        ],
         tup_filepaths_pypi,
-        desc="Installing PyPI packages",
-        unit="package",
-    ):
-        result_pip_install = subprocess.run(
-            [
-                os.environ["CONDA_EXE"],
-                "run",
-                "-n",
-                env_name,
-                "pip",
-                "install",
-                "--no-deps",
-                "--no-build-isolation",
-                str(filepath_pypi),
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        _logger.info(result_pip_install.stdout.decode(encoding))
-        if result_pip_install.returncode != 0:
-            _logger.warning(f"Failed to install PyPI package: {filepath_pypi}")
-            _logger.error(result_pip_install.stderr.decode(encoding))
-            list_filepaths_pypi_failed.append(filepath_pypi)
+        encoding,
+        "PyPI",
+        # 'conda run' runs the command via a batch file on Windows
+        max_length=(
+            MAX_LETTER_LENGTH_BAT
+            if sys.platform == "win32"
+            else MAX_LETTER_LENGTH_COMMAND
+        ),
+    )
 
     if list_filepaths_conda_failed:
         _logger.warning(
@@ -286,6 +381,9 @@ def generate_install_scripts(
     encoding = check_encoding(encoding)
     if env_name is None:
         env_name_list = get_env_list(encoding)
+        if dirpath_packages.name not in env_name_list:
+            # the environment may have been created after caching
+            env_name_list = get_env_list(encoding, refresh=True)
         if dirpath_packages.name in env_name_list:
             env_name = dirpath_packages.name
         else:
@@ -301,8 +399,9 @@ def generate_install_scripts(
         output_dir.mkdir(parents=True, exist_ok=True)
 
     # Find package files
-    tup_filepaths_conda = _get_conda_packages_path(dirpath_packages)
-    tup_filepaths_pypi = _get_pypi_packages_path(dirpath_packages)
+    tup_filepaths_conda, tup_filepaths_pypi = _get_packages_path(
+        dirpath_packages
+    )
 
     # Sort conda packages: python packages first
     tup_filepaths_conda_sorted = tuple(
@@ -340,7 +439,7 @@ def generate_install_scripts(
                 for filepath in tup_filepaths_conda_sorted
             ]
         )
-        n_str = sum(map(lambda x: len(x), tup_filepaths_conda_str))
+        n_str = sum(map(len, tup_filepaths_conda_str))
         _logger.debug(f"'{n_str}' letters.")
 
         n_split = (n_str // MAX_LETTER_LENGTH_BAT) + bool(
@@ -386,7 +485,7 @@ def generate_install_scripts(
                 for filepath in tup_filepaths_pypi
             ]
         )
-        n_str = sum(map(lambda x: len(x), tup_filepaths_pypi_str))
+        n_str = sum(map(len, tup_filepaths_pypi_str))
         _logger.debug(f"'{n_str}' letters.")
 
         n_split = (n_str // MAX_LETTER_LENGTH_BAT) + bool(
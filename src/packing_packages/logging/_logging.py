@@ -1,3 +1,4 @@
+import functools
 import importlib.util
 import os
 import re
@@ -19,6 +20,12 @@ from typing import Optional, TypeVar
 HandlerType = TypeVar("HandlerType", bound=Handler)
 
 
+@functools.lru_cache(maxsize=1)
+def _is_colorlog_installed() -> bool:
+    """Check if `colorlog` is installed (cached, `find_spec` is not free)."""
+    return importlib.util.find_spec("colorlog") is not None
+
+
 def _color_supported() -> bool:
     """
     Check if color output is supported in the current environment.
@@ -34,7 +41,7 @@ def _color_supported() -> bool:
     bool
         True if color output is supported, False otherwise.
     """
-    if not importlib.util.find_spec("colorlog"):
+    if not _is_colorlog_installed():
         return False
 
     # NO_COLOR environment variable:
@@ -473,13 +480,20 @@ class catch_default_handler:
     >>> logger.info("This will be logged again")
     """
 
-    null_handler = NullHandler()
+    def __init__(self) -> None:
+        # one entry per active `with` block so that an instance can be nested
+        self._states: list[tuple[bool, Optional[NullHandler]]] = []
 
     def __enter__(self) -> None:
         """Enter the context and disable the default handler."""
+        root_logger = get_library_root_logger()
+        had_default_handler = _default_handler in root_logger.handlers
         disable_default_handler()
-        if not get_library_root_logger().hasHandlers():
-            get_library_root_logger().addHandler(self.null_handler)
+        null_handler = None
+        if not root_logger.hasHandlers():
+            null_handler = NullHandler()
+            root_logger.addHandler(null_handler)
+        self._states.append((had_default_handler, null_handler))
 
     def __exit__(
         self,
@@ -487,10 +501,12 @@ class catch_default_handler:
         exc_value: Optional[Exception],
         traceback: Optional[TracebackType],
     ) -> None:
-        """Exit the context and restore the default handler."""
-        enable_default_handler()
-        if self.null_handler in get_library_root_logger().handlers:
-            get_library_root_logger().removeHandler(self.null_handler)
+        """Exit the context and undo what `__enter__` did."""
+        had_default_handler, null_handler = self._states.pop()
+        if null_handler is not None:
+            get_library_root_logger().removeHandler(null_handler)
+        if had_default_handler:
+            enable_default_handler()
 
 
 class catch_all_handler:
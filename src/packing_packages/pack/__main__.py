@@ -5,11 +5,12 @@ from pathlib import Path
 from typing import Optional
 
 from packing_packages.helpers import check_env_name
-from packing_packages.pack._core import packing_packages
 
 
 def pack(args: argparse.Namespace) -> None:
     """pack conda environment"""
+    from packing_packages.pack._core import packing_packages
+
     env_name = check_env_name(args.env_name, encoding=args.encoding)
 
     dirpath_target = Path(args.dirpath_target).resolve()
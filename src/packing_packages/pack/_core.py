@@ -3,11 +3,7 @@ import subprocess
 from pathlib import Path
 from typing import Optional, Union
 
-from packing_packages.helpers import (
-    check_encoding,
-    check_env_name,
-    is_installed,
-)
+from packing_packages.helpers import check_encoding, check_env_name
 from packing_packages.logging import get_child_logger
 
 from ._types import (
@@ -18,19 +14,11 @@ from ._types import (
 from ._utils import (
     check_conda_installation,
     check_python_version,
-    download_conda_package,
-    download_pypi_package,
+    download_packages,
     log_packing_results,
     prepare_output_directory,
 )
 
-if is_installed("tqdm"):
-    from tqdm.auto import tqdm  # type: ignore
-else:
-    from packing_packages.helpers import (  # type: ignore[assignment]
-        dummy_tqdm as tqdm,
-    )
-
 # Re-export for backward compatibility
 __all__ = (
     "Package",
@@ -86,9 +74,6 @@ def packing_packages(
         )
     )
 
-    dirpath_output_pypi = dirpath_output / "pypi"
-    dirpath_output_conda = dirpath_output / "conda"
-
     result_conda_list = subprocess.run(
         [
             os.environ["CONDA_EXE"],
@@ -98,7 +83,9 @@ def packing_packages(
         ],
         stdout=subprocess.PIPE,
     )
-    conda_list = result_conda_list.stdout.decode(encoding).splitlines()
+    conda_list = result_conda_list.stdout.decode(
+        encoding, errors="replace"
+    ).splitlines()
 
     # conda listの出力をパースする
     list_packages: list[Package] = []
@@ -118,43 +105,17 @@ def packing_packages(
 
     check_python_version(env_python_version)
 
-    list_failed_packages: list[Package] = []
-    for package in tqdm(list_packages):
-        # pypiの場合はダウンロードする
-        if package.channel == "pypi":
-            if (package.name, package.version) in st_existing_pypi:
-                _logger.info(
-                    f"'{package.name}=={package.version}' is already downloaded. Skipping..."
-                )
-                continue
-
-            if not download_pypi_package(
-                package,
-                dirpath_output_pypi,
-                env_python_version,
-                encoding,
-                dry_run,
-            ):
-                list_failed_packages.append(package)
-            continue
-
-        # conda
-        if package[:3] in st_existing_conda:
-            _logger.info(
-                f"'{package.name}-{package.version}-{package.build}' is already downloaded. Skipping..."
-            )
-            continue
-
-        if not download_conda_package(
-            package,
-            dirpath_pkgs,
-            dirpath_output_conda,
-            encoding,
-            dry_run,
-        ):
-            list_failed_packages.append(package)
-
-    log_packing_results(list_packages, list_failed_packages)
+    list_failed_packages, n_skipped = download_packages(
+        list_packages,
+        dirpath_pkgs,
+        dirpath_output,
+        env_python_version,
+        encoding,
+        dry_run,
+        st_existing_conda,
+        st_existing_pypi,
+    )
+    log_packing_results(list_packages, list_failed_packages, n_skipped)
 
 
 if __name__ == "__main__":
@@ -2,11 +2,24 @@
 
 import os
 import re
+from collections.abc import Iterator
 from pathlib import Path
 from typing import NamedTuple, Union
 
 from packing_packages.constants import EXTENSIONS_CONDA, EXTENSIONS_PYPI
 
+_PATTERNS_CONDA = tuple(
+    re.compile(rf"(.+)-(\d+.+?)-(.+)\.{re.escape(ext)}$")
+    for ext in EXTENSIONS_CONDA
+)
+"""conda package file names like 'name-version-build.ext'"""
+
+_PATTERNS_PYPI = tuple(
+    re.compile(rf"(.+)-(\d+.+?)-.+\.{re.escape(ext)}$")
+    for ext in EXTENSIONS_PYPI
+)
+"""PyPI package file names like 'name-version-tags.ext'"""
+
 
 class Package(NamedTuple):
     """Package information.
@@ -29,6 +42,12 @@ class Package(NamedTuple):
     channel: str
 
 
+def _iter_filenames(dirpath: Path) -> Iterator[str]:
+    """Walk a directory tree once and yield the names of all files."""
+    for _, _, filenames in os.walk(dirpath):
+        yield from filenames
+
+
 def get_existing_packages_conda(
     dirpath_output: Union[os.PathLike, str],
 ) -> set[tuple[str, str, str]]:
@@ -47,11 +66,9 @@ def get_existing_packages_conda(
     dirpath_output = Path(dirpath_output).resolve()
 
     st_packages_conda: set[tuple[str, str, str]] = set()
-    for ext in EXTENSIONS_CONDA:
-        for filepath_conda in dirpath_output.glob(f"**/*.{ext}"):
-            if match := (
-                re.match(rf"(.+)-(\d+.+?)-(.+)\.{ext}$", filepath_conda.name)
-            ):
+    for filename in _iter_filenames(dirpath_output):
+        for pattern in _PATTERNS_CONDA:
+            if match := pattern.match(filename):
                 package = Package(
                     name=match.group(1),
                     version=match.group(2),
@@ -59,6 +76,7 @@ def get_existing_packages_conda(
                     channel="",
                 )
                 st_packages_conda.add(package[:3])
+                break
     return st_packages_conda
 
 
@@ -80,11 +98,9 @@ def get_existing_packages_pypi(
     dirpath_output = Path(dirpath_output).resolve()
 
     st_packages_pypi: set[tuple[str, str]] = set()
-    for ext in EXTENSIONS_PYPI:
-        for filepath_pypi in dirpath_output.glob(f"**/*.{ext}"):
-            if match := re.match(
-                rf"(.+)-(\d+.+?)-.+\.{ext}$", filepath_pypi.name
-            ):
+    for filename in _iter_filenames(dirpath_output):
+        for pattern in _PATTERNS_PYPI:
+            if match := pattern.match(filename):
                 package = Package(
                     name=match.group(1),
                     version=match.group(2),
@@ -95,4 +111,5 @@ def get_existing_packages_pypi(
                 st_packages_pypi.add(
                     (package.name.replace("_", "-"), package.version)
                 )
+                break
     return st_packages_pypi
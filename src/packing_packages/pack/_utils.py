@@ -3,17 +3,24 @@
 This module contains common utility functions used by both pack._core and pack.yaml._core.
 """
 
+import hashlib
+import json
+import logging
 import os
-import re
 import subprocess
 import sys
+import threading
+import urllib.parse
 import urllib.request
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from shutil import copyfile
-from typing import Optional
+from shutil import copyfile, copyfileobj
+from typing import Any, Optional
 
 from packing_packages.constants import EXTENSIONS_CONDA
+from packing_packages.helpers import is_installed, run_streaming
 from packing_packages.logging import get_child_logger
 
 from ._types import (
@@ -22,8 +29,34 @@ from ._types import (
     get_existing_packages_pypi,
 )
 
+if is_installed("tqdm"):
+    from tqdm.auto import tqdm  # type: ignore
+else:
+    from packing_packages.helpers import (  # type: ignore[assignment]
+        dummy_tqdm as tqdm,
+    )
+
+if is_installed("urllib3"):
+    import urllib3  # type: ignore
+
 _logger = get_child_logger(__name__)
 
+ENV_FETCH_THREADS = "PACKING_FETCH_THREADS"
+"""Environment variable to set the number of threads for HTTP downloads.
+
+Like conda's 'CONDA_FETCH_THREADS'. If not set, up to 32 threads are used.
+"""
+
+MAX_CONDA_SUBPROCESSES = 4
+"""Maximum number of `conda search` subprocesses running at the same time.
+
+Each of them loads the whole repodata of the channels, so running many of
+them at once uses a lot of memory.
+"""
+
+CHUNK_SIZE = 1024 * 1024
+"""Buffer size in bytes to read and write downloaded files."""
+
 
 def check_conda_installation() -> Path:
     """Check conda installation and return conda package directory path.
@@ -42,7 +75,7 @@ def check_conda_installation() -> Path:
         raise ValueError(
             "Please install conda and set the CONDA_EXE environment variable."
         )
-    DIRPATH_CONDA_ROOT = Path(os.environ["CONDA_EXE"]).parent.parent.resolve()
+    DIRPATH_CONDA_ROOT = Path(os.environ["CONDA_EXE"]).resolve().parent.parent
     return DIRPATH_CONDA_ROOT / "pkgs"
 
 
@@ -51,7 +84,7 @@ def prepare_output_directory(
     env_name: str,
     diff_only: bool,
     dry_run: bool,
-) -> tuple[Path, set[tuple[str, str, str]], set[tuple[str, str]]]:
+) -> tuple[Path, frozenset[tuple[str, str, str]], frozenset[tuple[str, str]]]:
     """Prepare output directory and get existing packages if diff_only is True.
 
     Parameters
@@ -67,7 +100,7 @@ def prepare_output_directory(
 
     Returns
     -------
-    tuple[Path, set[tuple[str, str, str]], set[tuple[str, str]]]
+    tuple[Path, frozenset[tuple[str, str, str]], frozenset[tuple[str, str]]]
         Tuple of (output directory path, existing conda packages set, existing pypi packages set).
     """
     dirpath_target = dirpath_target.resolve()
@@ -82,8 +115,12 @@ def prepare_output_directory(
                 "Only downloading missing packages..."
             )
 
-            st_existing_conda = get_existing_packages_conda(dirpath_output)
-            st_existing_pypi = get_existing_packages_pypi(dirpath_output)
+            st_existing_conda = frozenset(
+                get_existing_packages_conda(dirpath_output)
+            )
+            st_existing_pypi = frozenset(
+                get_existing_packages_pypi(dirpath_output)
+            )
 
             # Update dirpath_output to diff directory
             dirpath_output = (
@@ -99,22 +136,18 @@ def prepare_output_directory(
                 "If you want to add only missing packages, set 'diff_only=True'."
             )
 
-            st_existing_conda = set()
-            st_existing_pypi = set()
+            st_existing_conda = frozenset()
+            st_existing_pypi = frozenset()
     else:
-        st_existing_conda = set()
-        st_existing_pypi = set()
-
-    if not dry_run:
-        os.makedirs(dirpath_output, exist_ok=True)
+        st_existing_conda = frozenset()
+        st_existing_pypi = frozenset()
 
     _logger.info(f"Packing to '{dirpath_output}'...")
 
-    dirpath_output_pypi = dirpath_output / "pypi"
-    dirpath_output_conda = dirpath_output / "conda"
-    for _dirpath in (dirpath_output_pypi, dirpath_output_conda):
-        if not dry_run:
-            os.makedirs(_dirpath, exist_ok=True)
+    if not dry_run:
+        # parents=True also creates dirpath_output
+        for _dirpath in (dirpath_output / "pypi", dirpath_output / "conda"):
+            _dirpath.mkdir(parents=True, exist_ok=True)
 
     return dirpath_output, st_existing_conda, st_existing_pypi
 
@@ -137,6 +170,55 @@ def check_python_version(env_python_version: str) -> None:
         )
 
 
+def _get_pip_command(
+    list_packages: Sequence[Package],
+    dirpath_output_pypi: Path,
+    env_python_version: str,
+    platform_pypi: Optional[str] = None,
+) -> list[str]:
+    """Build the pip command to download PyPI packages.
+
+    Parameters
+    ----------
+    list_packages : Sequence[Package]
+        Packages to download.
+    dirpath_output_pypi : Path
+        Output directory for PyPI packages.
+    env_python_version : str
+        Python version for the packages.
+    platform_pypi : str, optional
+        Platform specification for PyPI packages.
+
+    Returns
+    -------
+    list[str]
+        pip command.
+    """
+    cmd = [
+        sys.executable,
+        "-m",
+        "pip",
+        "download",
+        *(f"{package.name}=={package.version}" for package in list_packages),
+        "--no-deps",
+        "--python-version",
+        env_python_version,
+        "-d",
+        str(dirpath_output_pypi),
+    ]
+    if platform_pypi:
+        cmd.extend(["--platform", platform_pypi])
+    return cmd
+
+
+def _log_dry_run_pypi(list_packages: Sequence[Package]) -> None:
+    """Log PyPI packages that would be downloaded in a dry run."""
+    for package in list_packages:
+        _logger.info(
+            f"Would download '{package.name}=={package.version}' from PyPI."
+        )
+
+
 def download_pypi_package(
     package: Package,
     dirpath_output_pypi: Path,
@@ -158,7 +240,7 @@ def download_pypi_package(
     encoding : str
         Encoding for subprocess output.
     dry_run : bool
-        If True, do not download files.
+        If True, only log the package without running pip.
     platform_pypi : str, optional
         Platform specification for PyPI package.
 
@@ -168,158 +250,840 @@ def download_pypi_package(
         True if download succeeded, False otherwise.
     """
     if dry_run:
-        cmd = [
-            sys.executable,
-            "-m",
-            "pip",
-            "install",
-            f"{package.name}=={package.version}",
-            "--no-deps",
-            "--no-build-isolation",
-            "--python-version",
-            env_python_version,
-            "--dry-run",
-            "--force-reinstall",
-        ]
-        if platform_pypi:
-            cmd.extend(["--platform", platform_pypi])
-        else:
-            # For compatibility with original pack._core.py implementation
-            cmd.extend(["--target", dirpath_output_pypi.as_posix()])
-    else:
-        cmd = [
-            sys.executable,
-            "-m",
-            "pip",
-            "download",
-            f"{package.name}=={package.version}",
-            "--no-deps",
-            "--python-version",
-            env_python_version,
-            "-d",
-            str(dirpath_output_pypi),
-        ]
-        if platform_pypi:
-            cmd.extend(["--platform", platform_pypi])
+        _log_dry_run_pypi([package])
+        return True
 
-    result_pip_download = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+    result_pip_download = run_streaming(
+        _get_pip_command(
+            [package],
+            dirpath_output_pypi,
+            env_python_version,
+            platform_pypi,
+        ),
+        encoding,
+        _logger,
     )
 
-    _logger.info("\n" + result_pip_download.stdout.decode(encoding))
     if result_pip_download.returncode != 0:
         _logger.warning(f"'{package}' is not found.")
-        _logger.error(result_pip_download.stderr.decode(encoding))
+        _logger.error(result_pip_download.stderr)
         return False
     return True
 
 
-def download_conda_package(
-    package: Package,
-    dirpath_pkgs: Path,
-    dirpath_output_conda: Path,
+def download_pypi_packages(
+    list_packages: Sequence[Package],
+    dirpath_output_pypi: Path,
+    env_python_version: str,
     encoding: str,
     dry_run: bool,
-    platform_conda: Optional[str] = None,
-    channels: Optional[list[str]] = None,
+    platform_pypi: Optional[str] = None,
 ) -> bool:
-    """Download a conda package.
+    """Download PyPI packages with a single pip call.
+
+    pip reuses its session (connections) for all packages. But if any of
+    the packages is not found, pip fails as a whole, so the caller should
+    retry them one by one with `download_pypi_package`.
+
+    Parameters
+    ----------
+    list_packages : Sequence[Package]
+        Packages to download.
+    dirpath_output_pypi : Path
+        Output directory for PyPI packages.
+    env_python_version : str
+        Python version for the packages.
+    encoding : str
+        Encoding for subprocess output.
+    dry_run : bool
+        If True, only log the packages without running pip.
+    platform_pypi : str, optional
+        Platform specification for PyPI packages.
+
+    Returns
+    -------
+    bool
+        True if all packages were downloaded, False otherwise.
+    """
+    if not list_packages:
+        return True
+    if dry_run:
+        _log_dry_run_pypi(list_packages)
+        return True
+
+    result_pip_download = run_streaming(
+        _get_pip_command(
+            list_packages,
+            dirpath_output_pypi,
+            env_python_version,
+            platform_pypi,
+        ),
+        encoding,
+        _logger,
+    )
+
+    if result_pip_download.returncode != 0:
+        _logger.debug(result_pip_download.stderr)
+        return False
+    return True
+
+
+def copy_file_range(filepath_src: Path, filepath_dst: Path) -> None:
+    """Copy a file with ``os.copy_file_range``.
+
+    The data is copied in the kernel (or shared by reflink on file systems
+    like Btrfs and XFS). Falls back to ``shutil.copyfile`` if
+    ``os.copy_file_range`` is not available (e.g. other than Linux) or fails.
+
+    Parameters
+    ----------
+    filepath_src : Path
+        Source file path.
+    filepath_dst : Path
+        Destination file path.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(filepath_src, "rb") as fsrc:
+                with open(filepath_dst, "wb") as fdst:
+                    size = os.fstat(fsrc.fileno()).st_size
+                    while size > 0:
+                        n_copied = os.copy_file_range(
+                            fsrc.fileno(), fdst.fileno(), size
+                        )
+                        if n_copied == 0:
+                            raise OSError("copy_file_range copied no data.")
+                        size -= n_copied
+            return
+        except OSError:
+            pass
+    copyfile(filepath_src, filepath_dst)
+
+
+def link_or_copy(filepath_src: Path, filepath_dst: Path) -> None:
+    """Hard-link a file, or copy it if hard-linking is not possible.
+
+    Package files are never modified, so a hard link is as good as a copy
+    and costs no data I/O. Falls back to copying e.g. across devices or on
+    file systems without hard links.
+
+    Parameters
+    ----------
+    filepath_src : Path
+        Source file path.
+    filepath_dst : Path
+        Destination file path.
+    """
+    # overwrite like copyfile (os.link fails if the destination exists)
+    filepath_dst.unlink(missing_ok=True)
+    try:
+        os.link(filepath_src, filepath_dst)
+    except OSError:
+        copy_file_range(filepath_src, filepath_dst)
+
+
+def get_conda_package_cache(dirpath_pkgs: Path) -> dict[str, str]:
+    """Index conda package files in the conda package cache.
+
+    The directory is scanned only once so that each lookup afterwards does
+    not need any syscall.
 
     Parameters
     ----------
-    package : Package
-        Package to download.
     dirpath_pkgs : Path
         Conda package cache directory.
+
+    Returns
+    -------
+    dict[str, str]
+        Map of 'name-version-build' to the package file path.
+        Paths are kept as str so that no Path is built for packages
+        which are not used.
+    """
+    if not dirpath_pkgs.is_dir():
+        return {}
+    with os.scandir(dirpath_pkgs) as it:
+        # DirEntry.is_file() mostly does not need an extra stat call
+        st_filenames = {entry.name for entry in it if entry.is_file()}
+
+    # Same priority as EXTENSIONS_CONDA when both files of a package exist.
+    str_dirpath_pkgs = os.fspath(dirpath_pkgs)
+    dict_cache: dict[str, str] = {}
+    for ext in EXTENSIONS_CONDA:
+        suffix = f".{ext}"
+        for filename in st_filenames:
+            if filename.endswith(suffix):
+                dict_cache.setdefault(
+                    filename[: -len(suffix)],
+                    os.path.join(str_dirpath_pkgs, filename),
+                )
+    return dict_cache
+
+
+def copy_conda_package_from_cache(
+    package: Package,
+    dict_cache: dict[str, str],
+    dirpath_output_conda: Path,
+    dry_run: bool,
+) -> bool:
+    """Copy a conda package from the conda package cache.
+
+    Parameters
+    ----------
+    package : Package
+        Package to copy.
+    dict_cache : dict[str, str]
+        Index of the conda package cache (see `get_conda_package_cache`).
     dirpath_output_conda : Path
         Output directory for conda packages.
-    encoding : str
-        Encoding for subprocess output.
     dry_run : bool
-        If True, do not download files.
-    platform_conda : str, optional
-        Platform specification for conda package.
-    channels : list[str], optional
-        List of conda channels to use. If None, uses package.channel or defaults.
+        If True, do not copy files.
 
     Returns
     -------
     bool
-        True if download succeeded, False otherwise.
+        True if the package was found in the cache, False otherwise.
     """
-    tup_filepaths_package = tuple(
-        dirpath_pkgs
-        / f"{package.name}-{package.version}-{package.build}.{ext}"
-        for ext in EXTENSIONS_CONDA
+    path_package = dict_cache.get(
+        f"{package.name}-{package.version}-{package.build}"
     )
+    if path_package is None:
+        return False
+    filepath_package = Path(path_package)
 
     # あるときは、dirpath_pkgsからコピーする
-    for filepath_package in tup_filepaths_package:
-        if filepath_package.is_file():
-            _logger.info(f"Copying '{filepath_package.name}' from cache...")
-            if not dry_run:
-                copyfile(
-                    filepath_package,
-                    dirpath_output_conda / filepath_package.name,
-                )
-            return True
+    _logger.info(f"Copying '{filepath_package.name}' from cache...")
+    if not dry_run:
+        link_or_copy(
+            filepath_package,
+            dirpath_output_conda / filepath_package.name,
+        )
+    return True
+
+
+def get_conda_search_options(
+    platform_conda: Optional[str] = None,
+    channels: Optional[list[str]] = None,
+) -> Optional[list[str]]:
+    """Build the options for ``conda search``.
+
+    Parameters
+    ----------
+    platform_conda : str, optional
+        Platform specification for conda packages.
+    channels : list[str], optional
+        List of conda channels to use.
+
+    Returns
+    -------
+    Optional[list[str]]
+        Options for ``conda search``. None if channels are not specified;
+        the channel then depends on each package
+        (see `search_conda_package`).
+    """
+    if not channels:
+        return None
+    options = ["--platform", platform_conda] if platform_conda else []
+    options.extend(arg for channel in channels for arg in ("-c", channel))
+    return options
+
+
+def search_conda_package(
+    package: Package,
+    encoding: str,
+    platform_conda: Optional[str] = None,
+    options_conda: Optional[list[str]] = None,
+) -> Optional[dict[str, Any]]:
+    """Search the record of a conda package.
 
-    # ない場合は、直接ダウンロード
-    _logger.info(f"{package} is not found in the conda package cache.")
+    Parameters
+    ----------
+    package : Package
+        Package to search.
+    encoding : str
+        Encoding for subprocess output.
+    platform_conda : str, optional
+        Platform specification for conda package.
+        Only used if ``options_conda`` is None.
+    options_conda : list[str], optional
+        Options for ``conda search`` built by `get_conda_search_options`.
+        If None, uses package.channel or defaults.
 
+    Returns
+    -------
+    Optional[dict[str, Any]]
+        Record of the package including 'url' and 'sha256'.
+        None if the URL could not be detected.
+    """
+    if options_conda is None:
+        options_conda = (
+            ["--platform", platform_conda] if platform_conda else []
+        )
+        options_conda.extend(["-c", package.channel or "defaults"])
     cmd = [
         os.environ["CONDA_EXE"],
         "search",
         f"{package.name}={package.version}={package.build}",
         "--info",
+        "--json",
+        *options_conda,
     ]
-    if platform_conda:
-        cmd.extend(["--platform", platform_conda])
-    if channels:
-        for channel in channels:
-            cmd.extend(["-c", channel])
-    elif package.channel:
-        cmd.extend(["-c", package.channel])
-    else:
-        cmd.extend(["-c", "defaults"])
 
     result_conda_search = subprocess.run(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
+        encoding=encoding,
+        errors="replace",
     )
-    if match_conda_package_url := re.search(
-        r"url\s*:\s*(https?://\S+\.{})".format(
-            r"(?:" + r"|".join(EXTENSIONS_CONDA).replace(r".", r"\.") + r")"
-        ),
-        result_conda_search.stdout.decode(encoding),
+    stdout_conda_search = result_conda_search.stdout
+    # conda returns a map of package name -> list of matched records
+    try:
+        record = json.loads(stdout_conda_search)[package.name][0]
+        _ = record["url"]
+        return record
+    except (ValueError, LookupError, TypeError):
+        _logger.warning(
+            f"Could not detect the URL of the conda package '{package}'."
+        )
+        # on failure, conda reports the error as json in stdout
+        _logger.debug(stdout_conda_search)
+        return None
+
+
+def hash_file(filepath: Path) -> str:
+    """Calculate the SHA-256 digest of a file.
+
+    Parameters
+    ----------
+    filepath : Path
+        File path.
+
+    Returns
+    -------
+    str
+        Hex digest.
+    """
+    hash_sha256 = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hash_sha256.update(chunk)
+    return hash_sha256.hexdigest()
+
+
+def verify_file(filepath: Path, sha256: Optional[str]) -> bool:
+    """Verify the SHA-256 digest of a downloaded file.
+
+    A file whose digest does not match is removed.
+
+    Parameters
+    ----------
+    filepath : Path
+        File path.
+    sha256 : str, optional
+        Expected hex digest. If None, the file is not verified.
+
+    Returns
+    -------
+    bool
+        True if the digest matches or is not given, False otherwise.
+    """
+    if sha256 is None:
+        return True
+    if hash_file(filepath) == sha256.lower():
+        return True
+    _logger.warning(f"The SHA-256 of '{filepath.name}' does not match.")
+    filepath.unlink(missing_ok=True)
+    return False
+
+
+def get_proxy(url: str) -> Optional[str]:
+    """Get the proxy for a URL from the environment like ``urllib.request``.
+
+    ``HTTP_PROXY``, ``HTTPS_PROXY`` and ``NO_PROXY`` (and the platform
+    settings on Windows and macOS) are respected.
+
+    Parameters
+    ----------
+    url : str
+        URL to be downloaded.
+
+    Returns
+    -------
+    Optional[str]
+        Proxy URL. None if no proxy is used for the URL.
+    """
+    parts = urllib.parse.urlsplit(url)
+    proxy = urllib.request.getproxies().get(parts.scheme)
+    if not proxy or (
+        parts.hostname and urllib.request.proxy_bypass(parts.hostname)
     ):
-        url = match_conda_package_url.group(1)
-    else:
-        _logger.warning("Could not detect the URL of the conda package.")
+        return None
+    # like urllib, 'host:port' without a scheme means an HTTP proxy
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def get_pool_manager(
+    proxy: Optional[str] = None, maxsize: int = 1
+) -> "urllib3.PoolManager":
+    """Create a ``urllib3`` connection pool, through a proxy if given.
+
+    Parameters
+    ----------
+    proxy : str, optional
+        Proxy URL (see `get_proxy`). Credentials in it are sent to the proxy.
+    maxsize : int, default=1
+        Number of connections to keep per host.
+
+    Returns
+    -------
+    urllib3.PoolManager
+        ``urllib3.ProxyManager`` if ``proxy`` is given.
+    """
+    kwargs: dict[str, Any] = dict(
+        maxsize=maxsize,
+        retries=urllib3.Retry(total=3, backoff_factor=0.3),
+    )
+    if proxy is None:
+        return urllib3.PoolManager(**kwargs)
+    auth = urllib3.util.parse_url(proxy).auth
+    if auth:
+        kwargs["proxy_headers"] = urllib3.make_headers(
+            proxy_basic_auth=urllib.parse.unquote(auth)
+        )
+    return urllib3.ProxyManager(proxy, **kwargs)
+
+
+def download_file(
+    url: str, filepath: Path, http: Optional["urllib3.PoolManager"] = None
+) -> bool:
+    """Download a file.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    filepath : Path
+        Destination file path.
+    http : urllib3.PoolManager, optional
+        Connection pool to reuse (keep-alive) across downloads.
+        If None, ``urllib.request`` is used.
+
+    Returns
+    -------
+    bool
+        True if download succeeded, False otherwise.
+    """
+    try:
+        if http is None:
+            with urllib.request.urlopen(url) as response:
+                with open(filepath, "wb") as f:
+                    copyfileobj(response, f, CHUNK_SIZE)
+        else:
+            response = http.request("GET", url, preload_content=False)
+            try:
+                if response.status >= 400:
+                    raise OSError(
+                        f"HTTP Error {response.status}: {response.reason}"
+                    )
+                with open(filepath, "wb") as f:
+                    copyfileobj(response, f, CHUNK_SIZE)
+            finally:
+                response.release_conn()
+    except Exception as error:
+        _logger.exception(repr(error))
+        _logger.warning(
+            f"'{filepath.name}' could not be downloaded from {url}."
+        )
         return False
+    return True
 
-    filename_download_conda = Path(url).name
-    _logger.info(f"Downloading '{filename_download_conda}' from {url}")
-    if not dry_run:
+
+if is_installed("aiohttp"):
+    import asyncio
+
+    import aiohttp  # type: ignore
+
+    async def _download_file_async(
+        session: "aiohttp.ClientSession", url: str, filepath: Path
+    ) -> bool:
         try:
-            _ = urllib.request.urlretrieve(
-                url, dirpath_output_conda / filename_download_conda
-            )
+            async with session.get(url) as response:
+                response.raise_for_status()
+                with open(filepath, "wb") as f:
+                    async for chunk in response.content.iter_chunked(
+                        CHUNK_SIZE
+                    ):
+                        f.write(chunk)
         except Exception as error:
             _logger.exception(repr(error))
             _logger.warning(
-                f"'{filename_download_conda}' could not be downloaded from {url}."
+                f"'{filepath.name}' could not be downloaded from {url}."
             )
             return False
-    return True
+        return True
+
+    async def _download_files_async(
+        list_urls: list[tuple[str, Path]],
+    ) -> list[bool]:
+        # share one connection pool across all downloads
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=get_fetch_threads(len(list_urls))
+            ),
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=60),
+            # honor HTTP(S)_PROXY, NO_PROXY and .netrc like urllib
+            trust_env=True,
+        ) as session:
+            return list(
+                await asyncio.gather(
+                    *(
+                        _download_file_async(session, url, filepath)
+                        for url, filepath in list_urls
+                    )
+                )
+            )
+
+    def _download_files(list_urls: list[tuple[str, Path]]) -> list[bool]:
+        # run the event loop in another thread
+        # so that this also works under a running loop (e.g. Jupyter)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                asyncio.run, _download_files_async(list_urls)
+            ).result()
+elif is_installed("urllib3"):
+
+    def _download_files(list_urls: list[tuple[str, Path]]) -> list[bool]:
+        max_workers = get_fetch_threads(len(list_urls))
+        list_proxies = [get_proxy(url) for url, _ in list_urls]
+        # share one thread-safe connection pool (per proxy, usually just one)
+        # across all downloads
+        dict_http = {
+            proxy: get_pool_manager(proxy, max_workers)
+            for proxy in set(list_proxies)
+        }
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(
+                    executor.map(
+                        lambda url, filepath, proxy: download_file(
+                            url, filepath, dict_http[proxy]
+                        ),
+                        [url for url, _ in list_urls],
+                        [filepath for _, filepath in list_urls],
+                        list_proxies,
+                    )
+                )
+        finally:
+            for http in dict_http.values():
+                http.clear()
+else:
+
+    def _download_files(list_urls: list[tuple[str, Path]]) -> list[bool]:
+        with ThreadPoolExecutor(
+            max_workers=get_fetch_threads(len(list_urls))
+        ) as executor:
+            return list(
+                executor.map(lambda args: download_file(*args), list_urls)
+            )
+
+
+def download_files(
+    list_urls: list[tuple[str, Path]], dry_run: bool
+) -> list[bool]:
+    """Download files concurrently.
+
+    If ``aiohttp`` is installed, files are downloaded with asyncio sharing
+    one connection pool. Otherwise, a thread pool is used, sharing one
+    ``urllib3.PoolManager`` if ``urllib3`` is installed. Proxy settings in
+    the environment are respected in all cases.
+
+    Parameters
+    ----------
+    list_urls : list[tuple[str, Path]]
+        List of (URL, destination file path).
+    dry_run : bool
+        If True, do not download files.
+
+    Returns
+    -------
+    list[bool]
+        Whether each download succeeded, in the same order as ``list_urls``.
+    """
+    if _logger.isEnabledFor(logging.INFO):
+        for url, filepath in list_urls:
+            _logger.info(f"Downloading '{filepath.name}' from {url}")
+    if dry_run or not list_urls:
+        return [True] * len(list_urls)
+    return _download_files(list_urls)
+
+
+def get_max_workers(n_tasks: int) -> int:
+    """Get the number of threads used for local I/O-bound work.
+
+    Parameters
+    ----------
+    n_tasks : int
+        Number of tasks to be submitted.
+
+    Returns
+    -------
+    int
+        Number of worker threads, ``min(32, n_tasks)``.
+    """
+    return max(1, min(32, n_tasks))
+
+
+def get_fetch_threads(n_tasks: int) -> int:
+    """Get the number of threads used for HTTP downloads.
+
+    Parameters
+    ----------
+    n_tasks : int
+        Number of files to be downloaded.
+
+    Returns
+    -------
+    int
+        Number of worker threads. The value of ``PACKING_FETCH_THREADS`` is
+        used if set, otherwise ``min(32, n_tasks)``.
+
+    Raises
+    ------
+    ValueError
+        If ``PACKING_FETCH_THREADS`` is not a positive integer.
+    """
+    value = os.environ.get(ENV_FETCH_THREADS)
+    if value is None:
+        return get_max_workers(n_tasks)
+    try:
+        n_threads = int(value)
+    except ValueError:
+        n_threads = 0
+    if n_threads < 1:
+        raise ValueError(
+            f"{ENV_FETCH_THREADS} must be a positive integer, got {value!r}."
+        )
+    return n_threads
+
+
+def download_packages(
+    list_packages: list[Package],
+    dirpath_pkgs: Path,
+    dirpath_output: Path,
+    env_python_version: str,
+    encoding: str,
+    dry_run: bool,
+    st_existing_conda: frozenset[tuple[str, str, str]],
+    st_existing_pypi: frozenset[tuple[str, str]],
+    platform_pypi: Optional[str] = None,
+    platform_conda: Optional[str] = None,
+    channels: Optional[list[str]] = None,
+) -> tuple[list[Package], int]:
+    """Download conda and PyPI packages concurrently.
+
+    Packages that are already downloaded are skipped before any subprocess
+    is spawned. The others are processed in a thread pool because the work
+    is I/O-bound (pip and conda). PyPI packages are downloaded with a single
+    pip call, and retried one by one only if it fails. Conda packages not
+    found in the conda package cache are downloaded together afterwards
+    (see `download_files`). At most `MAX_CONDA_SUBPROCESSES` `conda search`
+    subprocesses run at the same time.
+
+    Parameters
+    ----------
+    list_packages : list[Package]
+        Packages to download.
+    dirpath_pkgs : Path
+        Conda package cache directory.
+    dirpath_output : Path
+        Output directory. Packages are saved in its 'conda' and 'pypi'
+        subdirectories.
+    env_python_version : str
+        Python version for PyPI packages.
+    encoding : str
+        Encoding for subprocess output.
+    dry_run : bool
+        If True, do not download files.
+    st_existing_conda : frozenset[tuple[str, str, str]]
+        Already downloaded conda packages (name, version, build).
+    st_existing_pypi : frozenset[tuple[str, str]]
+        Already downloaded PyPI packages (name, version).
+    platform_pypi : str, optional
+        Platform specification for PyPI packages.
+    platform_conda : str, optional
+        Platform specification for conda packages.
+    channels : list[str], optional
+        List of conda channels to use.
+
+    Returns
+    -------
+    tuple[list[Package], int]
+        Tuple of (failed packages, number of skipped packages).
+    """
+    # fail fast on an invalid PACKING_FETCH_THREADS before any subprocess
+    get_fetch_threads(1)
+
+    dirpath_output_pypi = dirpath_output / "pypi"
+    dirpath_output_conda = dirpath_output / "conda"
+
+    list_packages_download: list[Package] = []
+    for package in list_packages:
+        if package.channel == "pypi":
+            if (package.name, package.version) in st_existing_pypi:
+                _logger.debug(
+                    f"'{package.name}=={package.version}' is already downloaded. Skipping..."
+                )
+                continue
+        elif package[:3] in st_existing_conda:
+            _logger.debug(
+                f"'{package.name}-{package.version}-{package.build}' is already downloaded. Skipping..."
+            )
+            continue
+        list_packages_download.append(package)
+    n_skipped = len(list_packages) - len(list_packages_download)
+
+    list_packages_pypi = [
+        package
+        for package in list_packages_download
+        if package.channel == "pypi"
+    ]
+    list_packages_conda = [
+        package
+        for package in list_packages_download
+        if package.channel != "pypi"
+    ]
+
+    dict_cache = get_conda_package_cache(dirpath_pkgs)
+    options_conda = get_conda_search_options(platform_conda, channels)
+    # conda packages not found in the cache are downloaded afterwards
+    dict_records_conda: dict[Package, dict[str, Any]] = {}
+    semaphore_conda = threading.BoundedSemaphore(MAX_CONDA_SUBPROCESSES)
+
+    def _download_conda(package: Package) -> bool:
+        if copy_conda_package_from_cache(
+            package, dict_cache, dirpath_output_conda, dry_run
+        ):
+            return True
+        _logger.info(f"{package} is not found in the conda package cache.")
+        with semaphore_conda:
+            record = search_conda_package(
+                package, encoding, platform_conda, options_conda
+            )
+        if record is None:
+            return False
+        # e.g. a previous run was interrupted after downloading this file
+        filepath = dirpath_output_conda / Path(record["url"]).name
+        if (
+            record.get("sha256")
+            and filepath.is_file()
+            and hash_file(filepath) == record["sha256"].lower()
+        ):
+            _logger.info(f"'{filepath.name}' is already downloaded.")
+            return True
+        dict_records_conda[package] = record
+        return True
+
+    st_failed_packages: set[Package] = set()
+    with ThreadPoolExecutor(
+        max_workers=get_max_workers(len(list_packages_download))
+    ) as executor:
+        # all PyPI packages are downloaded with one pip call first
+        future_pypi = executor.submit(
+            download_pypi_packages,
+            list_packages_pypi,
+            dirpath_output_pypi,
+            env_python_version,
+            encoding,
+            dry_run,
+            platform_pypi,
+        )
+        dict_futures = {
+            executor.submit(_download_conda, package): package
+            for package in list_packages_conda
+        }
+        for future in tqdm(
+            as_completed([future_pypi, *dict_futures]),
+            total=len(dict_futures) + 1,
+        ):
+            # re-raise unexpected errors in the worker thread
+            future.result()
+
+        if not future_pypi.result():
+            # retry one by one to find out which packages failed. This is done
+            # serially: parallel pip processes may each build sdists and all
+            # write into the same directory.
+            _logger.info(
+                "Some PyPI packages could not be downloaded. "
+                "Retrying them one by one..."
+            )
+            st_failed_packages.update(
+                package
+                for package in list_packages_pypi
+                if not download_pypi_package(
+                    package,
+                    dirpath_output_pypi,
+                    env_python_version,
+                    encoding,
+                    dry_run,
+                    platform_pypi,
+                )
+            )
+
+        st_failed_packages.update(
+            package
+            for future, package in dict_futures.items()
+            if not future.result()
+        )
+
+    list_packages_url = list(dict_records_conda.keys())
+    list_filepaths = [
+        dirpath_output_conda / Path(dict_records_conda[package]["url"]).name
+        for package in list_packages_url
+    ]
+    list_success = download_files(
+        [
+            (dict_records_conda[package]["url"], filepath)
+            for package, filepath in zip(list_packages_url, list_filepaths)
+        ],
+        dry_run,
+    )
+    if not dry_run:
+        # hashlib releases the GIL, so threads are enough to hash in parallel
+        with ThreadPoolExecutor(
+            max_workers=get_max_workers(len(list_packages_url))
+        ) as executor:
+            list_success = list(
+                executor.map(
+                    lambda package, filepath, success: (
+                        success
+                        and verify_file(
+                            filepath, dict_records_conda[package].get("sha256")
+                        )
+                    ),
+                    list_packages_url,
+                    list_filepaths,
+                    list_success,
+                )
+            )
+    st_failed_packages.update(
+        package
+        for package, success in zip(list_packages_url, list_success)
+        if not success
+    )
+
+    list_failed_packages = [
+        package
+        for package in list_packages_download
+        if package in st_failed_packages
+    ]
+    return list_failed_packages, n_skipped
 
 
 def log_packing_results(
     list_packages: list[Package],
     list_failed_packages: list[Package],
+    n_skipped: int = 0,
 ) -> tuple[int, int]:
     """Log packing results.
 
@@ -329,6 +1093,9 @@ def log_packing_results(
         List of all packages.
     list_failed_packages : list[Package]
         List of failed packages.
+    n_skipped : int, optional
+        Number of packages skipped because they were already downloaded,
+        by default 0
 
     Returns
     -------
@@ -340,6 +1107,8 @@ def log_packing_results(
     _logger.info(
         f"{n_success} / {(n_success + n_failed)} packages are success!"
     )
+    if n_skipped > 0:
+        _logger.info(f"{n_skipped} packages are already downloaded. Skipped.")
 
     if n_failed > 0:
         for package in list_failed_packages:
@@ -13,6 +13,20 @@ dependencies into a specified directory.
 
 """
 
-from ._core import packing_packages_from_yaml
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._core import packing_packages_from_yaml
 
 __all__ = ("packing_packages_from_yaml",)
+
+
+def __getattr__(name: str) -> Any:
+    # lazy import (PEP 562) to keep the CLI startup light
+    if name in __all__:
+        from . import _core
+
+        value = getattr(_core, name)
+        globals()[name] = value  # later accesses skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
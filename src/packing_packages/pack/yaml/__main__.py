@@ -3,10 +3,10 @@ from collections.abc import Sequence
 from pathlib import Path
 from typing import Optional
 
-from packing_packages.pack.yaml._core import packing_packages_from_yaml
-
 
 def pack_from_yaml(args: argparse.Namespace) -> None:
+    from packing_packages.pack.yaml._core import packing_packages_from_yaml
+
     dirpath_target = Path(args.dirpath_target).resolve()
     if not dirpath_target.is_dir():
         raise FileNotFoundError(dirpath_target)
@@ -1,6 +1,8 @@
 import os
+import re
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import Literal, Optional, Union
+from typing import IO, Any, Literal, Optional, Union
 
 from packing_packages.helpers import check_encoding, is_installed
 from packing_packages.logging import get_child_logger
@@ -8,29 +10,71 @@ from packing_packages.pack._core import Package
 from packing_packages.pack._utils import (
     check_conda_installation,
     check_python_version,
-    download_conda_package,
-    download_pypi_package,
+    download_packages,
     log_packing_results,
     prepare_output_directory,
 )
 from packing_packages.pack.yaml.constants import PLATFORM_MAP
 
-if is_installed("tqdm"):
-    from tqdm.auto import tqdm  # type: ignore
-else:
-    from packing_packages.helpers import (  # type: ignore[assignment]
-        dummy_tqdm as tqdm,
-    )
-
-
 _logger = get_child_logger(__name__)
 
+_PATTERN_CONDA_SPEC = re.compile(r"^([^=]+)=([^=]+)=(.+)$")
+"""conda dependency like 'name=version=build'"""
+
+_PATTERN_PYPI_SPEC = re.compile(r"^([^=;\s]+)\s*==\s*([^;\s]+)")
+"""pip dependency like 'name==version', optionally followed by a marker"""
+
+
+def _iter_packages(dependencies: "Iterable[Any]") -> "Iterator[Package]":
+    """Parse 'dependencies' of an environment YAML file.
+
+    Parameters
+    ----------
+    dependencies : Iterable[Any]
+        'dependencies' of an environment YAML file.
+
+    Yields
+    ------
+    Package
+        conda packages, and PyPI packages of the 'pip' section with
+        channel 'pypi'.
+
+    Raises
+    ------
+    ValueError
+        If a dependency is not pinned like 'name=version=build'
+        (conda) or 'name==version' (pip).
+    """
+    for package_str in dependencies:
+        if isinstance(package_str, dict):
+            for package_pypi in package_str["pip"]:
+                if not (
+                    isinstance(package_pypi, str)
+                    and (match := _PATTERN_PYPI_SPEC.match(package_pypi))
+                ):
+                    raise ValueError(package_pypi)
+                name, version = match.group(1, 2)
+                yield Package(name, version, build="", channel="pypi")
+        elif isinstance(package_str, str):
+            if not (match := _PATTERN_CONDA_SPEC.match(package_str)):
+                raise ValueError(package_str)
+            name, version, build = match.group(1, 2, 3)
+            yield Package(name, version, build, "")
+        else:
+            raise ValueError(package_str)
+
 
 if is_installed("yaml"):
     import yaml  # type: ignore
 
+    try:
+        # libyaml (C implementation) is much faster if available
+        from yaml import CSafeLoader as SafeLoader  # type: ignore
+    except ImportError:
+        from yaml import SafeLoader  # type: ignore
+
     def packing_packages_from_yaml(
-        filepath_yaml: Union[os.PathLike, str],
+        filepath_yaml: Union[os.PathLike, str, IO],
         *,
         platform: Optional[
             Literal[
@@ -53,8 +97,8 @@ if is_installed("yaml"):
 
         Parameters
         ----------
-        filepath_yaml : str or os.PathLike
-            Path to the YAML file containing package specifications.
+        filepath_yaml : str, os.PathLike or file-like object
+            Path to the YAML file containing package specifications, or an already opened (text or binary) stream of it.
 
         platform : {"win-64", "win-32", "linux-64", "linux-aarch64", "linux-ppc64le", "linux-s390x", "osx-64", "osx-arm64"}, optional
             Target platform for which packages should be downloaded. If None, the current platform is used.
@@ -80,7 +124,6 @@ if is_installed("yaml"):
         # Downloads packages into ./downloads based on the current platform.
         """
 
-        filepath_yaml = Path(filepath_yaml)
         encoding = check_encoding(encoding)
 
         if dry_run:
@@ -94,15 +137,20 @@ if is_installed("yaml"):
                 "The platform will be detected from the current environment."
             )
         else:
-            platform_conda = PLATFORM_MAP[platform]["conda"]
-            platform_pypi = PLATFORM_MAP[platform]["pypi"]
+            dict_platform = PLATFORM_MAP[platform]
+            platform_conda = dict_platform["conda"]
+            platform_pypi = dict_platform["pypi"]
 
         dirpath_pkgs = check_conda_installation()
 
-        if not filepath_yaml.is_file():
-            raise FileNotFoundError(filepath_yaml)
-        with open(filepath_yaml, "r") as file:
-            dict_yaml = yaml.safe_load(file)
+        if isinstance(filepath_yaml, (str, os.PathLike)):
+            filepath_yaml = Path(filepath_yaml)
+            if not filepath_yaml.is_file():
+                raise FileNotFoundError(filepath_yaml)
+            with open(filepath_yaml, "rb") as file:
+                dict_yaml = yaml.load(file, Loader=SafeLoader)
+        else:
+            dict_yaml = yaml.load(filepath_yaml, Loader=SafeLoader)
 
         env_name = Path(dict_yaml["name"]).name
         channels = dict_yaml["channels"]
@@ -116,70 +164,46 @@ if is_installed("yaml"):
             )
         )
 
-        dirpath_output_pypi = dirpath_output / "pypi"
-        dirpath_output_conda = dirpath_output / "conda"
-
-        env_python_version: Optional[str] = None
-        list_packages: list[Package] = list()
-        for package_str in dict_yaml["dependencies"]:
-            if isinstance(package_str, dict):
-                for package_pypi in package_str["pip"]:
-                    assert isinstance(package_pypi, str)
-                    name, version = package_pypi.split("==")
-                    list_packages.append(
-                        Package(name, version, build="", channel="pypi")
-                    )
-            elif isinstance(package_str, str):
-                name, version, build = package_str.split("=")
-                list_packages.append(Package(name, version, build, ""))
-
-                if name.lower() == "python":
-                    env_python_version = version
-            else:
-                raise ValueError(package_str)
+        list_packages = list(_iter_packages(dict_yaml["dependencies"]))
+        env_python_version = next(
+            (
+                package.version
+                for package in list_packages
+                if package.channel != "pypi"
+                and package.name.lower() == "python"
+            ),
+            None,
+        )
 
         assert env_python_version is not None, "Python has not found."
 
+        # Remove duplicated packages while keeping the order.
+        n_packages = len(list_packages)
+        list_packages = list(dict.fromkeys(list_packages))
+        if len(list_packages) < n_packages:
+            _logger.debug(
+                f"{n_packages - len(list_packages)} duplicated packages are removed."
+            )
+
         check_python_version(env_python_version)
 
-        list_failed_packages: list[Package] = []
-        for package in tqdm(list_packages):
-            if package.channel == "pypi":
-                if (package.name, package.version) in st_existing_pypi:
-                    _logger.info(
-                        f"'{package.name}=={package.version}' is already downloaded. Skipping..."
-                    )
-                    continue
-
-                if not download_pypi_package(
-                    package,
-                    dirpath_output_pypi,
-                    env_python_version,
-                    encoding,
-                    dry_run,
-                    platform_pypi,
-                ):
-                    list_failed_packages.append(package)
-            else:
-                # conda
-                if package[:3] in st_existing_conda:
-                    _logger.info(
-                        f"'{package.name}-{package.version}-{package.build}' is already downloaded. Skipping..."
-                    )
-                    continue
-
-                if not download_conda_package(
-                    package,
-                    dirpath_pkgs,
-                    dirpath_output_conda,
-                    encoding,
-                    dry_run,
-                    platform_conda,
-                    channels,
-                ):
-                    list_failed_packages.append(package)
+        list_failed_packages, n_skipped = download_packages(
+            list_packages,
+            dirpath_pkgs,
+            dirpath_output,
+            env_python_version,
+            encoding,
+            dry_run,
+            st_existing_conda,
+            st_existing_pypi,
+            platform_pypi=platform_pypi,
+            platform_conda=platform_conda,
+            channels=channels,
+        )
 
-        _, n_failed = log_packing_results(list_packages, list_failed_packages)
+        _, n_failed = log_packing_results(
+            list_packages, list_failed_packages, n_skipped
+        )
         n_success = len(list_packages) - n_failed
         if n_failed > n_success:
             _logger.warning(
@@ -1,4 +1,7 @@
-PLATFORM_MAP = {
+from collections.abc import Mapping
+from types import MappingProxyType
+
+_PLATFORM_MAP = {
     "win-64": {
         "pypi": "win_amd64",
         "conda": "win-64",
@@ -32,8 +35,14 @@ PLATFORM_MAP = {
         "conda": "osx-arm64",
     },
 }
+PLATFORM_MAP: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {
+        platform: MappingProxyType(dict_platform)
+        for platform, dict_platform in _PLATFORM_MAP.items()
+    }
+)
 """
-This dictionary `PLATFORM_MAP` maps platform identifiers used in package management
+This read-only mapping `PLATFORM_MAP` maps platform identifiers used in package management
 to corresponding platform strings for PyPI and Conda repositories.
 
 Keys represent platform identifiers typically used in package distribution:
@@ -55,4 +64,6 @@ Examples of usage:
   `PLATFORM_MAP['win-64']['pypi']` returns 'win_amd64'
 - To obtain the Conda platform string for macOS ARM 64-bit:
   `PLATFORM_MAP['osx-arm64']['conda']` returns 'osx-arm64'
+
+It cannot be modified by accident because it is shared by all calls.
 """
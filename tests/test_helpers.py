@@ -0,0 +1,24 @@
+import importlib.util
+from unittest import mock
+
+import pytest
+
+from packing_packages.helpers import is_installed
+
+
+def test_is_installed_cached():
+    is_installed.cache_clear()
+    with mock.patch.object(
+        importlib.util, "find_spec", wraps=importlib.util.find_spec
+    ) as mock_find_spec:
+        assert is_installed("sys")
+        assert is_installed("sys")
+    mock_find_spec.assert_called_once_with("sys")
+
+
+@pytest.mark.parametrize(
+    "package_name, expected",
+    [("sys", True), ("nonexistent_package_12345", False)],
+)
+def test_is_installed(package_name, expected):
+    assert is_installed(package_name) is expected
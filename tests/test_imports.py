@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = (
+    "packing_packages.pack._core",
+    "packing_packages.pack._utils",
+    "packing_packages.pack.yaml._core",
+    "packing_packages.install._core",
+    "urllib3",
+)
+
+
+def _get_imported_heavy_modules(code: str) -> list[str]:
+    """Run `code` in a fresh interpreter and list the heavy modules it imported."""
+    code += (
+        "\nimport json, sys"
+        f"\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "cli_args",
+    [
+        ["-v"],
+        ["--help"],
+        ["pack", "--help"],
+        ["pack", "yaml", "--help"],
+        ["install", "--help"],
+    ],
+)
+def test_main_lazy_imports(cli_args):
+    code = (
+        "from packing_packages.__main__ import main\n"
+        "try:\n"
+        f"    main({cli_args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    assert _get_imported_heavy_modules(code) == []
+
+
+@pytest.mark.parametrize(
+    "package, name",
+    [
+        ("packing_packages.pack", "packing_packages"),
+        ("packing_packages.pack.yaml", "packing_packages_from_yaml"),
+        ("packing_packages.install", "install_packages"),
+    ],
+)
+def test_package_lazy_imports(package, name):
+    assert _get_imported_heavy_modules(f"import {package}") == []
+    # the heavy modules are imported only when the attribute is accessed
+    assert _get_imported_heavy_modules(f"import {package}\n{package}.{name}")
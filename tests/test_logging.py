@@ -0,0 +1,52 @@
+from contextlib import ExitStack
+from logging import NullHandler
+
+import pytest
+
+from packing_packages.logging import _logging, catch_default_handler
+
+
+@pytest.mark.parametrize("depth", [1, 2, 64])
+def test_catch_default_handler_nested(depth):
+    root_logger = _logging.get_library_root_logger()
+    default_handler = _logging._default_handler
+    assert default_handler in root_logger.handlers
+    handlers = root_logger.handlers.copy()
+
+    with ExitStack() as stack:
+        for _ in range(depth):
+            stack.enter_context(catch_default_handler())
+        with catch_default_handler():
+            pass
+        # the inner context must not re-enable the default handler
+        assert default_handler not in root_logger.handlers
+
+    assert set(root_logger.handlers) == set(handlers)
+
+
+def test_catch_default_handler_reused_instance():
+    root_logger = _logging.get_library_root_logger()
+    default_handler = _logging._default_handler
+    handlers = root_logger.handlers.copy()
+
+    cm = catch_default_handler()
+    with cm:
+        with cm:
+            assert default_handler not in root_logger.handlers
+        assert default_handler not in root_logger.handlers
+
+    assert set(root_logger.handlers) == set(handlers)
+
+
+def test_catch_default_handler_keeps_added_handler():
+    root_logger = _logging.get_library_root_logger()
+    default_handler = _logging._default_handler
+    handler = NullHandler()
+
+    try:
+        with catch_default_handler():
+            root_logger.addHandler(handler)
+        assert handler in root_logger.handlers
+        assert default_handler in root_logger.handlers
+    finally:
+        root_logger.removeHandler(handler)